@@ -1,7 +1,9 @@
 import os
-import math
+import csv
 import re
-import statistics
+import threading
+import uuid
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -13,10 +15,45 @@ BOM_SHEET = "Sheet1"            # 시트 이름
 CONFIG_FILE = "film_config.csv" # 품번별 필름 조건 저장
 THICKNESS_FILE = "film_thickness.csv"  # 두께 9회 측정 결과 저장
 
+# 저장 CSV 스키마 (컬럼 순서 + dtype, 문자 컬럼은 object, 나머지는 float64)
+# 값이 비어 있거나 정수처럼 보여도 dtype이 바뀌지 않게 읽을 때 그대로 지정
+CONFIG_DTYPES = {
+    "품번": object, "품명": object,
+    "필름두께_mm": "float64", "지관외경_cm": "float64",
+    "아이마크세트길이_cm": "float64", "세트당라벨수": "float64",
+}
+THICKNESS_DTYPES = {
+    "품번": object, "품명": object, "거래처": object,
+    "측정1": "float64", "측정2": "float64", "측정3": "float64",
+    "측정4": "float64", "측정5": "float64", "측정6": "float64",
+    "측정7": "float64", "측정8": "float64", "측정9": "float64",
+    "평균": "float64", "표준편차": "float64",
+}
+CONFIG_COLUMNS = list(CONFIG_DTYPES)
+THICKNESS_COLUMNS = list(THICKNESS_DTYPES)
+
+_DIAM_SPLIT = re.compile(r"[,\s]+")   # 직경 목록 구분자 (쉼표/공백/줄바꿈)
+
 
 # =========================================
 # 데이터 로드 / 저장
 # =========================================
+def read_bom_excel():
+    """BOM 엑셀 읽기 (python-calamine 있으면 사용, 없으면 openpyxl)"""
+    # 필요한 두 컬럼만 읽되, 컬럼이 없으면 load_bom의 컬럼 검사에서 안내하도록 callable 사용
+    kwargs = dict(sheet_name=BOM_SHEET, usecols=lambda c: c in ("품번", "품명.1"))
+    try:
+        return pd.read_excel(BOM_FILE, engine="calamine", **kwargs)
+    except ImportError:
+        # python-calamine 미설치
+        pass
+    except ValueError as e:
+        # calamine 엔진을 모르는 예전 pandas 버전만 대체, 나머지 오류는 그대로 전달
+        if "Unknown engine" not in str(e):
+            raise
+    return pd.read_excel(BOM_FILE, engine="openpyxl", **kwargs)
+
+
 @st.cache_data
 def load_bom():
     """BOM에서 품번/품명 로드 (C열 품번, D열 품명 사용)"""
@@ -25,7 +62,7 @@ def load_bom():
         return pd.DataFrame(columns=["품번", "품명"])
 
     try:
-        df = pd.read_excel(BOM_FILE, sheet_name=BOM_SHEET)
+        df = read_bom_excel()
     except Exception as e:
         st.error(f"BOM 파일 읽는 중 오류: {e}")
         return pd.DataFrame(columns=["품번", "품명"])
@@ -38,77 +75,201 @@ def load_bom():
     bom = df[["품번", "품명.1"]].dropna(subset=["품번"])
     bom = bom.drop_duplicates(subset=["품번"])
     bom = bom.rename(columns={"품명.1": "품명"})
+    # 품번은 로드 시 한 번만 문자열로 변환해 두고 이후 비교/조회에 그대로 사용
+    bom["품번"] = bom["품번"].astype("string")
     return bom[["품번", "품명"]]
 
 
-def load_config():
-    """저장된 필름 조건 로드"""
-    if not os.path.exists(CONFIG_FILE):
-        return pd.DataFrame(columns=[
-            "품번", "품명",
-            "필름두께_mm", "지관외경_cm",
-            "아이마크세트길이_cm", "세트당라벨수"
-        ])
+# BOM 전체를 해시하지 않도록 (BOM 파일 mtime, 행 수)를 키로 사용, 결과는 복사 없이 공유 (읽기 전용)
+@st.cache_resource(show_spinner=False)
+def bom_index(bom_key, _bom_df: pd.DataFrame):
+    """품번 -> 품명 조회용 dict"""
+    return dict(zip(_bom_df["품번"], _bom_df["품명"]))
+
+
+@st.cache_resource(show_spinner=False)
+def get_pumbun_list(bom_key, _bom_df: pd.DataFrame):
+    """선택 상자용 품번 목록 (정렬된 tuple)"""
+    return tuple(sorted(_bom_df["품번"].unique()))
+
+
+def index_by_pumbun(df: pd.DataFrame):
+    """품번(문자열)을 인덱스로 설정 (품번 컬럼은 그대로 유지, 중복은 마지막 값 사용)"""
+    df = df.assign(품번=df["품번"].astype("string"))
+    df = df.set_index(df["품번"], inplace=False)
+    df.index.name = None
+    return df[~df.index.duplicated(keep="last")]
+
+
+def file_mtime(path):
+    """파일 수정 시각 (캐시 키용, 파일이 없으면 None)"""
     try:
-        df = pd.read_csv(CONFIG_FILE, encoding="utf-8-sig")
-    except Exception:
-        df = pd.read_csv(CONFIG_FILE)
-    return df
+        return os.path.getmtime(path)
+    except OSError:
+        return None
 
 
-def save_config(df: pd.DataFrame):
-    """필름 조건 저장"""
-    df.to_csv(CONFIG_FILE, index=False, encoding="utf-8-sig")
-    st.session_state["config_df"] = df
+def write_csv_atomic(df: pd.DataFrame, path):
+    """CSV를 임시 파일에 쓴 뒤 교체 (쓰는 도중 종료돼도 기존 파일이 깨지지 않게)"""
+    tmp = path + ".tmp"
+    df.to_csv(tmp, index=False, encoding="utf-8-sig", lineterminator="\n")
+    os.replace(tmp, path)
+
+
+@st.cache_resource
+def save_lock():
+    """저장 CSV 쓰기용 잠금 (모든 세션 공용, 추가 기록과 파일 정리가 겹치지 않게)"""
+    return threading.Lock()
+
+
+def read_csv_header(path):
+    """CSV 첫 줄(헤더) 컬럼 목록 (읽을 수 없으면 None)"""
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return next(csv.reader(f), None)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def ends_with_newline(path):
+    """파일이 줄바꿈으로 끝나는지 (직접 편집해 마지막 줄바꿈이 빠진 경우 확인용)"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def append_csv_row(df: pd.DataFrame, key, row, path, columns):
+    """저장된 CSV 끝에 row(품번 key의 새 값) 한 행만 추가
+    (df에는 아직 반영 전, 파일이 없거나 헤더가 다르면 df + row 전체를 새로 씀)"""
+    with save_lock():
+        if read_csv_header(path) != list(columns):
+            full = df.copy()
+            full.loc[key] = row
+            write_csv_atomic(full, path)
+            return
+        missing_newline = not ends_with_newline(path)
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            if missing_newline:
+                f.write("\n")
+            pd.DataFrame([row], columns=columns).to_csv(
+                f, header=False, index=False, lineterminator="\n"
+            )
 
 
-def load_thickness():
-    """두께 9회 측정 데이터 로드"""
-    if not os.path.exists(THICKNESS_FILE):
-        return pd.DataFrame(columns=[
-            "품번", "품명", "거래처",
-            "측정1", "측정2", "측정3",
-            "측정4", "측정5", "측정6",
-            "측정7", "측정8", "측정9",
-            "평균", "표준편차"
-        ])
+def compact_saved_csv(compact: pd.DataFrame, path, mtime):
+    """중복 행을 정리한 데이터로 파일 교체 (읽은 뒤 파일이 바뀌었으면 건너뜀)"""
+    with save_lock():
+        if file_mtime(path) != mtime:
+            return
+        try:
+            write_csv_atomic(compact, path)
+        except OSError:
+            # 엑셀 등에서 파일을 잡고 있으면 다음 세션 시작 때 다시 정리
+            pass
+
+
+def read_saved_csv(path, dtypes):
+    """저장 CSV 로드 (같은 품번이 여러 번 있으면 마지막 행 사용, 중복이 있었는지도 함께 반환)"""
+    if not os.path.exists(path):
+        empty = pd.DataFrame({c: pd.Series(dtype=t) for c, t in dtypes.items()})
+        return empty, False
     try:
-        df = pd.read_csv(THICKNESS_FILE, encoding="utf-8-sig")
+        df = pd.read_csv(path, encoding="utf-8-sig", dtype=dtypes)
     except Exception:
-        df = pd.read_csv(THICKNESS_FILE)
-    return df
+        df = pd.read_csv(path, dtype=dtypes)
+    # 저장 시 행을 컬럼 순서대로 넣기 때문에 스키마 순서/dtype을 고정
+    df = df.reindex(columns=list(dtypes)).astype(dtypes)
+
+    compact = df.drop_duplicates(subset=["품번"], keep="last")
+    return compact, len(compact) < len(df)
+
+
+def new_data_version():
+    """표시용 캐시 키 (세션마다 고유, 데이터를 읽거나 저장할 때마다 새로 발급)"""
+    return uuid.uuid4().hex
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def display_table(version, _df: pd.DataFrame):
+    """저장 데이터 표시용 Arrow 테이블 (version이 같으면 재변환 없이 그대로 사용)"""
+    try:
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(_df, preserve_index=False)
+    except (ImportError, TypeError, ValueError):
+        return _df
 
 
-def save_thickness(df: pd.DataFrame):
-    """두께 9회 측정 데이터 저장"""
-    df.to_csv(THICKNESS_FILE, index=False, encoding="utf-8-sig")
+@st.cache_data(show_spinner=False)
+def load_config(mtime=None):
+    """저장된 필름 조건 로드 (mtime이 바뀌면 다시 읽음, (데이터, 중복 여부) 반환)"""
+    return read_saved_csv(CONFIG_FILE, CONFIG_DTYPES)
+
+
+def save_config(df: pd.DataFrame, pumbun, new_row):
+    """필름 조건 저장 (변경된 품번 행만 추가 기록, 파일 저장이 성공하면 df에 반영)"""
+    row = [new_row[c] for c in CONFIG_COLUMNS]
+    append_csv_row(df, pumbun, row, CONFIG_FILE, CONFIG_COLUMNS)
+    # 품번 인덱스 기준으로 있으면 갱신, 없으면 추가
+    df.loc[pumbun] = row
+    load_config.clear()
+    st.session_state["config_df"] = df
+    st.session_state["config_version"] = new_data_version()
+
+
+@st.cache_data(show_spinner=False)
+def load_thickness(mtime=None):
+    """두께 9회 측정 데이터 로드 (mtime이 바뀌면 다시 읽음, (데이터, 중복 여부) 반환)"""
+    return read_saved_csv(THICKNESS_FILE, THICKNESS_DTYPES)
+
+
+def save_thickness(df: pd.DataFrame, pumbun, new_row):
+    """두께 9회 측정 데이터 저장 (변경된 품번 행만 추가 기록, 파일 저장이 성공하면 df에 반영)"""
+    row = [new_row[c] for c in THICKNESS_COLUMNS]
+    append_csv_row(df, pumbun, row, THICKNESS_FILE, THICKNESS_COLUMNS)
+    df.loc[pumbun] = row
+    load_thickness.clear()
     st.session_state["thick_df"] = df
+    st.session_state["thick_version"] = new_data_version()
 
 
 # =========================================
 # 계산 함수 (엑셀 수식 그대로)
 # INT((PI()*(((E/100)^2 - (F/100)^2)/(4*(D/1000)))) / (G/100)) * H
 # =========================================
-def calc_labels_per_roll(thickness_mm, roll_diam_cm, core_diam_cm,
-                         mark_set_cm, labels_per_set):
+def calc_labels_per_roll_array(thickness_mm, roll_diams_cm, core_diam_cm,
+                               mark_set_cm, labels_per_set):
+    """직경 배열에 대해 1롤 수량을 한 번에 계산"""
+    d = np.asarray(roll_diams_cm, dtype=np.float64)
     if (thickness_mm is None or thickness_mm <= 0 or
-        roll_diam_cm is None or roll_diam_cm <= 0 or
         core_diam_cm is None or core_diam_cm <= 0 or
         mark_set_cm is None or mark_set_cm <= 0 or
         labels_per_set is None or labels_per_set <= 0):
-        return 0
+        return np.zeros(d.shape, dtype=np.int64)
 
-    if roll_diam_cm <= core_diam_cm:
-        return 0
+    with np.errstate(over="ignore", invalid="ignore"):
+        film_length_m = np.pi * (((d / 100) ** 2 - (core_diam_cm / 100) ** 2) /
+                                 (4 * (thickness_mm / 1000)))
+        sets = np.floor(film_length_m / (mark_set_cm / 100))
+        labels_f = sets * int(labels_per_set)
+
+    # 지관보다 작거나 같은 직경, inf/int64 범위를 넘는 값은 0개
+    ok = ((d > core_diam_cm) & np.isfinite(labels_f)
+          & (labels_f < np.iinfo(np.int64).max))
+    labels = np.zeros(d.shape, dtype=np.int64)
+    labels[ok] = sets[ok].astype(np.int64) * int(labels_per_set)
+    return labels
 
-    try:
-        film_length_m = math.pi * (((roll_diam_cm / 100) ** 2 - (core_diam_cm / 100) ** 2) /
-                                   (4 * (thickness_mm / 1000)))
-        sets = film_length_m / (mark_set_cm / 100)
-        labels = int(sets) * int(labels_per_set)
-        return int(labels)
-    except Exception:
-        return 0
+
+def calc_labels_per_roll(thickness_mm, roll_diam_cm, core_diam_cm,
+                         mark_set_cm, labels_per_set):
+    """직경 하나에 대한 1롤 수량 (calc_labels_per_roll_array와 같은 계산)"""
+    return int(calc_labels_per_roll_array(
+        thickness_mm, [roll_diam_cm], core_diam_cm, mark_set_cm, labels_per_set
+    )[0])
 
 
 # =========================================
@@ -121,15 +282,29 @@ bom_df = load_bom()
 if bom_df.empty:
     st.stop()
 
+# 세션 시작 시 로드, 추가 기록으로 쌓인 중복 행이 있으면 파일도 정리
 if "config_df" not in st.session_state:
-    st.session_state["config_df"] = load_config()
+    cfg_mtime = file_mtime(CONFIG_FILE)
+    cfg_df, cfg_dups = load_config(cfg_mtime)
+    if cfg_dups:
+        compact_saved_csv(cfg_df, CONFIG_FILE, cfg_mtime)
+    st.session_state["config_df"] = index_by_pumbun(cfg_df)
+    st.session_state["config_version"] = new_data_version()
 if "thick_df" not in st.session_state:
-    st.session_state["thick_df"] = load_thickness()
+    thk_mtime = file_mtime(THICKNESS_FILE)
+    thk_df, thk_dups = load_thickness(thk_mtime)
+    if thk_dups:
+        compact_saved_csv(thk_df, THICKNESS_FILE, thk_mtime)
+    st.session_state["thick_df"] = index_by_pumbun(thk_df)
+    st.session_state["thick_version"] = new_data_version()
 
 config_df = st.session_state["config_df"]
 thick_df = st.session_state["thick_df"]
 
-품번_list = bom_df["품번"].astype(str).sort_values().tolist()
+bom_key = (file_mtime(BOM_FILE), len(bom_df))
+bom_map = bom_index(bom_key, bom_df)
+
+품번_list = get_pumbun_list(bom_key, bom_df)
 
 tab1, tab2 = st.tabs(["1롤 수량 계산", "필름 두께 측정/평균"])
 
@@ -140,63 +315,71 @@ with tab1:
     st.markdown("### 1️⃣ 품번 선택")
 
     selected_pumbun = st.selectbox("BOM에서 품번 선택", 품번_list, key="tab1_pumbun")
-    row = bom_df[bom_df["품번"].astype(str) == str(selected_pumbun)]
-    품명 = row["품명"].iloc[0] if not row.empty else ""
+    품명 = bom_map.get(selected_pumbun, "")
     st.write(f"**품명:** {품명}")
 
     st.markdown("### 2️⃣ 이 품번의 필름 조건 설정")
 
     # 기존 설정 불러오기
-    exist = config_df[config_df["품번"].astype(str) == str(selected_pumbun)]
-    if not exist.empty:
-        default_thickness = float(exist["필름두께_mm"].iloc[0])
-        default_core_d = float(exist["지관외경_cm"].iloc[0])
-        default_mark_set = float(exist["아이마크세트길이_cm"].iloc[0])
-        default_labels_per_set = int(exist["세트당라벨수"].iloc[0])
+    try:
+        exist = config_df.loc[selected_pumbun]
+    except KeyError:
+        exist = None
+    if exist is not None:
+        default_thickness = float(exist["필름두께_mm"])
+        default_core_d = float(exist["지관외경_cm"])
+        default_mark_set = float(exist["아이마크세트길이_cm"])
+        default_labels_per_set = int(exist["세트당라벨수"])
     else:
         default_thickness = 0.135
         default_core_d = 9.0
         default_mark_set = 11.45
         default_labels_per_set = 5
 
-    c1, c2, c3, c4 = st.columns(4)
-    with c1:
-        thickness_mm = st.number_input(
-            "필름 두께 (mm)",
-            min_value=0.001,
-            step=0.001,
-            format="%.3f",
-            value=default_thickness,
-            key=f"thk_{selected_pumbun}",
-        )
-    with c2:
-        core_diam_cm = st.number_input(
-            "지관 외경 (cm)",
-            min_value=0.1,
-            step=0.1,
-            format="%.1f",
-            value=default_core_d,
-            key=f"core_{selected_pumbun}",
-        )
-    with c3:
-        mark_set_cm = st.number_input(
-            "아이마크 세트 길이 (cm)",
-            min_value=0.1,
-            step=0.01,
-            format="%.2f",
-            value=default_mark_set,
-            key=f"mark_{selected_pumbun}",
-        )
-    with c4:
-        labels_per_set = st.number_input(
-            "세트당 라벨 개수 (장)",
-            min_value=1,
-            step=1,
-            value=default_labels_per_set,
-            key=f"lps_{selected_pumbun}",
-        )
+    # 폼으로 묶어서 값 입력 중에는 재실행하지 않고, 버튼을 눌렀을 때만 반영
+    with st.form("cfg_form"):
+        c1, c2, c3, c4 = st.columns(4)
+        with c1:
+            thickness_mm = st.number_input(
+                "필름 두께 (mm)",
+                min_value=0.001,
+                step=0.001,
+                format="%.3f",
+                value=default_thickness,
+                key=f"thk_{selected_pumbun}",
+            )
+        with c2:
+            core_diam_cm = st.number_input(
+                "지관 외경 (cm)",
+                min_value=0.1,
+                step=0.1,
+                format="%.1f",
+                value=default_core_d,
+                key=f"core_{selected_pumbun}",
+            )
+        with c3:
+            mark_set_cm = st.number_input(
+                "아이마크 세트 길이 (cm)",
+                min_value=0.1,
+                step=0.01,
+                format="%.2f",
+                value=default_mark_set,
+                key=f"mark_{selected_pumbun}",
+            )
+        with c4:
+            labels_per_set = st.number_input(
+                "세트당 라벨 개수 (장)",
+                min_value=1,
+                step=1,
+                value=default_labels_per_set,
+                key=f"lps_{selected_pumbun}",
+            )
 
-    if st.button("💾 이 품번 설정 저장하기", key="save_cfg"):
+        b1, b2 = st.columns(2)
+        b1.form_submit_button("🔄 계산에 반영")
+        save_cfg = b2.form_submit_button("💾 이 품번 설정 저장하기")
+
+    if save_cfg:
         new_row = {
             "품번": selected_pumbun,
             "품명": 품명,
@@ -206,14 +389,12 @@ with tab1:
             "세트당라벨수": labels_per_set,
         }
 
-        if not exist.empty:
-            idx = config_df[config_df["품번"].astype(str) == str(selected_pumbun)].index
-            config_df.loc[idx, :] = new_row
+        try:
+            save_config(config_df, selected_pumbun, new_row)
+        except OSError as e:
+            st.error(f"설정 파일 저장 중 오류 (엑셀에서 열려 있으면 닫고 다시 저장해줘): {e}")
         else:
-            config_df = pd.concat([config_df, pd.DataFrame([new_row])], ignore_index=True)
-
-        save_config(config_df)
-        st.success("이 품번의 필름 설정을 저장했어!")
+            st.success("이 품번의 필름 설정을 저장했어!")
 
     st.markdown("### 3️⃣ 실물 직경별 1롤 수량 계산")
 
@@ -225,31 +406,27 @@ with tab1:
         placeholder="예) 29.9, 29.8, 26.8",
     )
 
-    diam_list = []
-    if diam_raw.strip():
-        tokens = re.split(r"[,\s]+", diam_raw.strip())
-        for t in tokens:
-            if not t:
-                continue
-            try:
-                d = float(t)
-                diam_list.append(d)
-            except ValueError:
-                st.warning(f"숫자로 인식할 수 없는 값이라 무시했어: {t}")
-
-    if (diam_list and thickness_mm > 0 and core_diam_cm > 0
+    diam_text = diam_raw.strip()
+    tokens = pd.Series(
+        [t for t in _DIAM_SPLIT.split(diam_text) if t] if diam_text else [],
+        dtype=object,
+    )
+    diam_arr = pd.to_numeric(tokens, errors="coerce")
+    bad = diam_arr.isna()
+    for t in tokens[bad]:
+        st.warning(f"숫자로 인식할 수 없는 값이라 무시했어: {t}")
+    diam_list = diam_arr[~bad].to_numpy(dtype=np.float64)
+
+    if (diam_list.size and thickness_mm > 0 and core_diam_cm > 0
             and mark_set_cm > 0 and labels_per_set > 0):
-        rows = []
-        for d in diam_list:
-            qty = calc_labels_per_roll(
-                thickness_mm, d, core_diam_cm, mark_set_cm, labels_per_set
-            )
-            rows.append({
-                "실물 직경 (cm)": d,
-                "1롤 수량 (개)": qty,
-            })
+        qtys = calc_labels_per_roll_array(
+            thickness_mm, diam_list, core_diam_cm, mark_set_cm, labels_per_set
+        )
 
-        result_df = pd.DataFrame(rows)
+        result_df = pd.DataFrame({
+            "실물 직경 (cm)": diam_list,
+            "1롤 수량 (개)": qtys,
+        })
         st.dataframe(result_df, use_container_width=True)
     else:
         st.info("직경 목록을 입력하면 이 아래에 직경별 1롤 수량이 계산돼.")
@@ -258,7 +435,11 @@ with tab1:
         if config_df.empty:
             st.write("아직 저장된 설정이 없어.")
         else:
-            st.dataframe(config_df, use_container_width=True)
+            st.dataframe(
+                display_table(st.session_state["config_version"], config_df),
+                use_container_width=True,
+                hide_index=True,
+            )
 
 
 # =========================================
@@ -272,28 +453,30 @@ with tab2:
         품번_list,
         key="tab2_pumbun"
     )
-    row2 = bom_df[bom_df["품번"].astype(str) == str(selected_pumbun2)]
-    품명2 = row2["품명"].iloc[0] if not row2.empty else ""
+    품명2 = bom_map.get(selected_pumbun2, "")
     st.write(f"**필름명:** {품명2}")
 
     거래처 = st.text_input("거래처", value="", placeholder="예) (주)아이제이팩")
 
     # 기존 측정값 있으면 불러오기
-    exist_t = thick_df[thick_df["품번"].astype(str) == str(selected_pumbun2)]
-    if not exist_t.empty:
+    try:
+        exist_t = thick_df.loc[selected_pumbun2]
+    except KeyError:
+        exist_t = None
+    if exist_t is not None:
         base_vals = [
-            exist_t["측정1"].iloc[0],
-            exist_t["측정2"].iloc[0],
-            exist_t["측정3"].iloc[0],
-            exist_t["측정4"].iloc[0],
-            exist_t["측정5"].iloc[0],
-            exist_t["측정6"].iloc[0],
-            exist_t["측정7"].iloc[0],
-            exist_t["측정8"].iloc[0],
-            exist_t["측정9"].iloc[0],
+            exist_t["측정1"],
+            exist_t["측정2"],
+            exist_t["측정3"],
+            exist_t["측정4"],
+            exist_t["측정5"],
+            exist_t["측정6"],
+            exist_t["측정7"],
+            exist_t["측정8"],
+            exist_t["측정9"],
         ]
         base_vals = [float(v) if pd.notna(v) else 0.0 for v in base_vals]
-        base_vendor = exist_t["거래처"].iloc[0]
+        base_vendor = exist_t["거래처"]
         if not 거래처:
             거래처 = base_vendor
     else:
@@ -301,34 +484,40 @@ with tab2:
 
     st.markdown("### 2️⃣ 두께 9회 측정값 입력 (mm)")
 
-    inputs = []
-    labels = ["1차측정", "2차측정", "3차측정",
-              "4차측정", "5차측정", "6차측정",
-              "7차측정", "8차측정", "9차측정"]
-
-    # 3개씩 나눠서 입력 (3열 × 3행)
-    idx = 0
-    for _ in range(3):
-        cols = st.columns(3)
-        for c in cols:
-            val = c.number_input(
-                labels[idx],
-                min_value=0.0,
-                step=0.001,
-                format="%.3f",
-                value=base_vals[idx],
-                key=f"t_{selected_pumbun2}_{idx}",
-            )
-            inputs.append(val)
-            idx += 1
+    # 3열 × 3행 표 하나로 입력 (행 순서대로 1~9차), 버튼을 눌렀을 때만 결과 반영
+    grid_df = pd.DataFrame(
+        np.array(base_vals, dtype=np.float64).reshape(3, 3),
+        index=["1~3차", "4~6차", "7~9차"],
+        columns=["A", "B", "C"],
+    )
+    measure_col = st.column_config.NumberColumn(
+        min_value=0.0,
+        step=0.001,
+        format="%.3f",
+    )
+
+    with st.form("thickness_form"):
+        edited = st.data_editor(
+            grid_df,
+            key=f"t_{selected_pumbun2}",
+            num_rows="fixed",
+            use_container_width=True,
+            column_config={c: measure_col for c in grid_df.columns},
+        )
+        # 비워 둔 칸은 0(미측정)으로 처리
+        inputs = edited.fillna(0.0).to_numpy(dtype=np.float64).ravel()
+
+        b1, b2 = st.columns(2)
+        b1.form_submit_button("🔄 평균/표준편차 계산")
+        save_t = b2.form_submit_button("💾 이 품번의 두께 측정값 저장하기")
 
     # 0보다 큰 값만 유효 측정으로 간주
-    valid_vals = [v for v in inputs if v > 0]
+    valid_vals = inputs[inputs > 0]
 
-    if valid_vals:
-        avg = sum(valid_vals) / len(valid_vals)
-        if len(valid_vals) > 1:
-            std = statistics.stdev(valid_vals)   # 샘플 표준편차
+    if valid_vals.size:
+        avg = float(valid_vals.mean())
+        if valid_vals.size > 1:
+            std = float(valid_vals.std(ddof=1))   # 샘플 표준편차
         else:
             std = 0.0
     else:
@@ -339,7 +528,7 @@ with tab2:
     st.write(f"**평균 두께:** {avg:.3f} mm")
     st.write(f"**표준편차:** {std:.6f} mm")
 
-    if st.button("💾 이 품번의 두께 측정값 저장하기", key="save_thickness"):
+    if save_t:
         new_row_t = {
             "품번": selected_pumbun2,
             "품명": 품명2,
@@ -357,18 +546,20 @@ with tab2:
             "표준편차": std,
         }
 
-        if not exist_t.empty:
-            idx_t = thick_df[thick_df["품번"].astype(str) == str(selected_pumbun2)].index
-            thick_df.loc[idx_t, :] = new_row_t
+        try:
+            save_thickness(thick_df, selected_pumbun2, new_row_t)
+        except OSError as e:
+            st.error(f"두께 파일 저장 중 오류 (엑셀에서 열려 있으면 닫고 다시 저장해줘): {e}")
         else:
-            thick_df = pd.concat([thick_df, pd.DataFrame([new_row_t])], ignore_index=True)
-
-        save_thickness(thick_df)
-        st.success("이 품번의 두께 측정 정보를 저장했어!")
+            st.success("이 품번의 두께 측정 정보를 저장했어!")
 
     st.markdown("### 4️⃣ 저장된 두께 측정 결과")
 
     if thick_df.empty:
         st.write("아직 저장된 두께 측정 데이터가 없어.")
     else:
-        st.dataframe(thick_df, use_container_width=True)
+        st.dataframe(
+            display_table(st.session_state["thick_version"], thick_df),
+            use_container_width=True,
+            hide_index=True,
+        )